@@ -5,81 +5,76 @@ Command-line interface for the Cloudinary CLI tool.
 import argparse
 import sys
 import os
-from .config import initialize_cloudinary
-from .cloudinary_ops import (
-    upload_files,
-    upload_single_file,
-    list_folders_in_melted,
-    delete_folder,
-    download_folder,
-    list_files_in_folder,
-)
+from . import __version__
+from .output import log
+
+COMMANDS = ("upload", "file", "list", "files", "download", "delete")
 
 
 def show_help():
     """Display available commands and usage examples."""
-    print("\n🌤️  Cloudinary Management Tool")
-    print("=" * 50)
-    print("\nAvailable commands:")
-    print(
+    log("\n🌤️  Cloudinary Management Tool")
+    log("=" * 50)
+    log("\nAvailable commands:")
+    log(
         "  upload <local_path> <cloud_folder>    - Upload file or directory to Cloudinary"
     )
-    print("  file <file_path>                      - Upload single file (interactive)")
-    print("  list                                  - List folders in 'melted'")
-    print("  files                                 - List files in a selected folder")
-    print("  download                              - Download a folder from 'melted'")
-    print("  delete                                - Delete a folder from 'melted'")
-    print("\nUsage examples:")
-    print(
+    log("  file <file_path>                      - Upload single file (interactive)")
+    log("  list                                  - List folders in 'melted'")
+    log("  files                                 - List files in a selected folder")
+    log("  download                              - Download a folder from 'melted'")
+    log("  delete                                - Delete a folder from 'melted'")
+    log("\nUsage examples:")
+    log(
         "  python main.py upload ./images my_photos           # Upload to default/my_photos"
     )
-    print(
+    log(
         "  python main.py upload ./photo.jpg single           # Upload to default/single"
     )
-    print("  python main.py upload ./images photos --force      # Force re-upload")
-    print("  python main.py upload ./images custom/path        # Explicit path")
-    print(
+    log("  python main.py upload ./images photos --force      # Force re-upload")
+    log("  python main.py upload ./images custom/path        # Explicit path")
+    log(
         "  python main.py file ./document.pdf                 # Interactive file upload"
     )
-    print("  python main.py list")
-    print(
-        "  python main.py files                                # List files in folder"
-    )
-    print("  python main.py download                             # Download a folder")
-    print("  python main.py delete")
-    print("\n💡 Notes:")
-    print("  - Supports all file types (images, videos, documents, etc.)")
-    print("  - Preserves original filenames (no random suffixes)")
-    print("  - Automatically creates folders under default folder (set in .env)")
-    print("  - Set CLOUDINARY_DEFAULT_FOLDER in .env to change default location")
-    print("  - Leave CLOUDINARY_DEFAULT_FOLDER empty to use root folder")
-    print("  - Set CLOUDINARY_UNIQUE_NAMES=true to generate unique filenames")
-    print("  - Skips existing files by default (use --force to re-upload)")
-    print("  - Upload preserves subdirectory structure for directories")
-    print("  - Automatically skips hidden and temporary files")
-    print("  - Compresses large files (>100MB) using 7z with volume splitting")
-    print("  - Automatically decompresses 7z files on download")
-    print("  - Creates remote folder if it doesn't exist")
-    print("\nFor more help on a specific command, use:")
-    print("  python main.py <command> --help")
+    log("  python main.py list")
+    log("  python main.py files                                # List files in folder")
+    log("  python main.py download                             # Download a folder")
+    log("  python main.py delete")
+    log("\n💡 Notes:")
+    log("  - Supports all file types (images, videos, documents, etc.)")
+    log("  - Preserves original filenames (no random suffixes)")
+    log("  - Automatically creates folders under default folder (set in .env)")
+    log("  - Set CLOUDINARY_DEFAULT_FOLDER in .env to change default location")
+    log("  - Leave CLOUDINARY_DEFAULT_FOLDER empty to use root folder")
+    log("  - Set CLOUDINARY_UNIQUE_NAMES=true to generate unique filenames")
+    log("  - Skips existing files by default (use --force to re-upload)")
+    log("  - Upload preserves subdirectory structure for directories")
+    log("  - Automatically skips hidden and temporary files")
+    log("  - Compresses large files (>100MB) using 7z with volume splitting")
+    log("  - Automatically decompresses 7z files on download")
+    log("  - Creates remote folder if it doesn't exist")
+    log("\nFor more help on a specific command, use:")
+    log("  python main.py <command> --help")
 
 
 def interactive_upload():
     """Interactive file upload."""
-    print("\n📤 Interactive File Upload")
-    print("=" * 30)
+    from .cloudinary_ops import upload_single_file
+
+    log("\n📤 Interactive File Upload")
+    log("=" * 30)
 
     # Get file path
     while True:
         file_path = input("Enter file path: ").strip()
         if not file_path:
-            print("❌ File path cannot be empty")
+            log("❌ File path cannot be empty")
             continue
         if not os.path.exists(file_path):
-            print(f"❌ File not found: {file_path}")
+            log(f"❌ File not found: {file_path}")
             continue
         if not os.path.isfile(file_path):
-            print(f"❌ Path is not a file: {file_path}")
+            log(f"❌ Path is not a file: {file_path}")
             continue
         break
 
@@ -87,7 +82,7 @@ def interactive_upload():
     cloud_folder = input("Enter cloud folder name: ").strip()
     if not cloud_folder:
         cloud_folder = "uploads"
-        print(f"Using default folder: {cloud_folder}")
+        log(f"Using default folder: {cloud_folder}")
 
     # Ask about duplicates
     skip_duplicates = True
@@ -95,28 +90,32 @@ def interactive_upload():
     if force_upload in ["y", "yes"]:
         skip_duplicates = False
 
-    print(f"\n📤 Uploading '{file_path}' to '{cloud_folder}'...")
+    log(f"\n📤 Uploading '{file_path}' to '{cloud_folder}'...")
     success, uploaded, skipped = upload_single_file(
         file_path, cloud_folder, skip_duplicates
     )
 
     if success:
         if uploaded > 0:
-            print(f"✅ Upload completed successfully!")
+            log(f"✅ Upload completed successfully!")
         elif skipped > 0:
-            print(f"⏭️  File was skipped (already exists)")
+            log(f"⏭️  File was skipped (already exists)")
     else:
-        print(f"❌ Upload failed")
+        log(f"❌ Upload failed")
 
 
 def interactive_list_folders():
     """Interactive folder listing."""
+    from .cloudinary_ops import list_folders_in_melted
+
     folders = list_folders_in_melted()
     return folders
 
 
 def interactive_delete():
     """Interactive folder deletion."""
+    from .cloudinary_ops import list_folders_in_melted, delete_folder
+
     folders = list_folders_in_melted()
     if not folders:
         return
@@ -135,7 +134,7 @@ def interactive_delete():
                 folder_path = selected_folder["path"]
 
                 # Confirm deletion
-                print(
+                log(
                     f"\n⚠️  You are about to delete folder '{folder_path}' and ALL its contents."
                 )
                 confirm = input("Are you sure? Type 'DELETE' to confirm: ").strip()
@@ -143,16 +142,18 @@ def interactive_delete():
                 if confirm == "DELETE":
                     delete_folder(folder_path)
                 else:
-                    print("❌ Deletion cancelled")
+                    log("❌ Deletion cancelled")
                 return
             else:
-                print("❌ Invalid selection")
+                log("❌ Invalid selection")
         except ValueError:
-            print("❌ Please enter a valid number")
+            log("❌ Please enter a valid number")
 
 
 def interactive_download():
     """Interactive folder download."""
+    from .cloudinary_ops import list_folders_in_melted, download_folder
+
     folders = list_folders_in_melted()
     if not folders:
         return
@@ -176,13 +177,15 @@ def interactive_download():
                 download_folder(folder_path, download_path)
                 return
             else:
-                print("❌ Invalid selection")
+                log("❌ Invalid selection")
         except ValueError:
-            print("❌ Please enter a valid number")
+            log("❌ Please enter a valid number")
 
 
 def interactive_list_files():
     """Interactive file listing in folders."""
+    from .cloudinary_ops import list_folders_in_melted, list_files_in_folder
+
     folders = list_folders_in_melted()
     if not folders:
         return
@@ -197,61 +200,102 @@ def interactive_list_files():
                 list_files_in_folder(folder_path)
                 return
             else:
-                print("❌ Invalid selection")
+                log("❌ Invalid selection")
         except ValueError:
-            print("❌ Please enter a valid number")
+            log("❌ Please enter a valid number")
 
 
-def main():
-    """Main CLI entry point."""
-    try:
-        # Initialize Cloudinary
-        initialize_cloudinary()
-    except ValueError as e:
-        print(f"❌ Configuration Error: {e}")
-        sys.exit(1)
+def _sniff_subcommand(argv):
+    """Return the first non-flag argument, which names the subcommand."""
+    for arg in argv:
+        if not arg.startswith("-"):
+            return arg
+    return None
 
-    # Check command line arguments
-    if len(sys.argv) == 1:
-        show_help()
-        return
 
-    # Create argument parser
+def build_parser(command=None):
+    """Build the argument parser, adding only the subparser for `command`.
+
+    All subparsers are built when `command` is not a known command, so that
+    argparse can report the valid choices.
+    """
     parser = argparse.ArgumentParser(
         description="Cloudinary Management Tool",
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
 
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+    subparsers = parser.add_subparsers(
+        dest="command",
+        help="Available commands",
+        metavar="{" + ",".join(COMMANDS) + "}",
+    )
+    build_all = command not in COMMANDS
 
     # Upload command
-    upload_parser = subparsers.add_parser("upload", help="Upload files or directories")
-    upload_parser.add_argument("local_path", help="Local file or directory path")
-    upload_parser.add_argument("cloud_folder", help="Cloudinary folder name")
-    upload_parser.add_argument(
-        "--force", action="store_true", help="Force re-upload existing files"
-    )
+    if build_all or command == "upload":
+        upload_parser = subparsers.add_parser(
+            "upload", help="Upload files or directories"
+        )
+        upload_parser.add_argument("local_path", help="Local file or directory path")
+        upload_parser.add_argument("cloud_folder", help="Cloudinary folder name")
+        upload_parser.add_argument(
+            "--force", action="store_true", help="Force re-upload existing files"
+        )
 
     # File command (interactive upload)
-    file_parser = subparsers.add_parser("file", help="Upload single file interactively")
-    file_parser.add_argument("file_path", nargs="?", help="File path to upload")
+    if build_all or command == "file":
+        file_parser = subparsers.add_parser(
+            "file", help="Upload single file interactively"
+        )
+        file_parser.add_argument("file_path", nargs="?", help="File path to upload")
 
     # List command
-    subparsers.add_parser("list", help="List folders")
+    if build_all or command == "list":
+        subparsers.add_parser("list", help="List folders")
 
     # Files command
-    subparsers.add_parser("files", help="List files in a folder")
+    if build_all or command == "files":
+        subparsers.add_parser("files", help="List files in a folder")
 
     # Download command
-    subparsers.add_parser("download", help="Download a folder")
+    if build_all or command == "download":
+        subparsers.add_parser("download", help="Download a folder")
 
     # Delete command
-    subparsers.add_parser("delete", help="Delete a folder")
+    if build_all or command == "delete":
+        subparsers.add_parser("delete", help="Delete a folder")
+
+    return parser
+
+
+def main():
+    """Main CLI entry point."""
+    # Show help/version without loading configuration or the Cloudinary SDK
+    if len(sys.argv) == 1 or sys.argv[1] in ("-h", "--help"):
+        show_help()
+        return
+    if sys.argv[1] == "--version":
+        log(f"Cloudinary CLI {__version__}")
+        return
 
+    # Parse arguments first: subcommand help and usage errors exit here
+    # without needing any configuration
+    parser = build_parser(_sniff_subcommand(sys.argv[1:]))
     args = parser.parse_args()
 
+    from .config import initialize_cloudinary
+
+    try:
+        # Initialize Cloudinary
+        initialize_cloudinary()
+    except ValueError as e:
+        log(f"❌ Configuration Error: {e}")
+        sys.exit(1)
+
     # Execute commands
     if args.command == "upload":
+        from .cloudinary_ops import upload_files
+
         skip_duplicates = not args.force
         upload_files(args.local_path, args.cloud_folder, skip_duplicates)
 
@@ -269,6 +313,8 @@ def main():
             if force_upload in ["y", "yes"]:
                 skip_duplicates = False
 
+            from .cloudinary_ops import upload_single_file
+
             upload_single_file(args.file_path, cloud_folder, skip_duplicates)
         else:
             interactive_upload()
@@ -3,12 +3,20 @@ Cloudinary operations module.
 Handles upload, download, list, and delete operations.
 """
 
+import atexit
+import functools
 import os
 import shutil
-import requests
-import cloudinary.uploader
-import cloudinary.api
-from .config import should_use_unique_names
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .config import (
+    should_use_unique_names,
+    get_worker_count,
+    get_max_file_size_bytes,
+)
 from .utils import (
     get_resource_type,
     should_skip_file,
@@ -16,11 +24,177 @@ from .utils import (
     get_cloudinary_filename,
     get_folder_url,
 )
-from .compression import compress_large_file, detect_and_decompress_archives
+from .output import log, flush_log
+from .compression import (
+    MAX_PARALLEL_COMPRESSIONS,
+    compress_large_file,
+    compress_many,
+    decompress_7z_file,
+    detect_and_decompress_archives,
+)
+
+# Shared HTTP session for downloads, created on first use
+_SESSION = None
+_session_lock = threading.Lock()
+
+# Read/write size for streaming downloads
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Files larger than this are uploaded in chunks with upload_large
+LARGE_UPLOAD_THRESHOLD = 20 * 1024 * 1024
+LARGE_UPLOAD_CHUNK_SIZE = 6_000_000
+UPLOAD_MAX_ATTEMPTS = 3
+
+# Attempts per file for downloads
+DOWNLOAD_MAX_ATTEMPTS = 3
+
+
+def _get_session():
+    """Get the shared requests session (keep-alive + connection pool)."""
+    global _SESSION
+    with _session_lock:
+        if _SESSION is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+    return _SESSION
+
+
+# Shared thread pool for network I/O and background cleanup, created on
+# first use and reused by every command
+_io_pool = None
+_io_pool_lock = threading.Lock()
+
+
+def _get_io_pool():
+    """Get the shared I/O thread pool."""
+    global _io_pool
+    with _io_pool_lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(
+                max_workers=get_worker_count(), thread_name_prefix="cld-io"
+            )
+            # Make sure running work finishes before exit
+            atexit.register(_io_pool.shutdown, wait=True)
+    return _io_pool
+
+
+def _cancel_pending(futures):
+    """Cancel futures that have not started yet, e.g. after Ctrl-C.
+
+    Work already running on the pool is left to finish; everything still
+    queued is dropped so the process can exit promptly.
+    """
+    for future in futures:
+        future.cancel()
+
+
+# Temporary files removed in the background for uploads started from the
+# main thread, created on first use
+_cleanup_pool = None
+_cleanup_lock = threading.Lock()
+
+
+def _remove_quietly(func, *args, **kwargs):
+    """Run a cleanup function, reporting instead of raising errors."""
+    try:
+        func(*args, **kwargs)
+    except OSError as e:
+        log(f"⚠️  Could not remove temporary files: {e}")
+
+
+def _cleanup_temp_files(func, *args, **kwargs):
+    """Run a cleanup function off the upload path.
+
+    Uploads running on pool threads are already off the main thread, so they
+    clean up inline. The main thread hands the work to a small cleanup pool
+    so that upload_single_file returns right away.
+    """
+    global _cleanup_pool
+    if threading.current_thread() is not threading.main_thread():
+        _remove_quietly(func, *args, **kwargs)
+        return
+
+    with _cleanup_lock:
+        if _cleanup_pool is None:
+            _cleanup_pool = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="cleanup"
+            )
+            # Make sure pending cleanups finish before exit
+            atexit.register(_cleanup_pool.shutdown, wait=True)
+    _cleanup_pool.submit(_remove_quietly, func, *args, **kwargs)
+
+
+def _is_retryable(error):
+    """Check if an upload/download error is transient (network or 5xx)."""
+    import requests
+    import urllib3.exceptions
+    import cloudinary.exceptions
+
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code >= 500
+    if isinstance(
+        error,
+        (
+            cloudinary.exceptions.BadRequest,
+            cloudinary.exceptions.AuthorizationRequired,
+            cloudinary.exceptions.NotAllowed,
+            cloudinary.exceptions.NotFound,
+            cloudinary.exceptions.AlreadyExists,
+        ),
+    ):
+        return False
+    return isinstance(
+        error,
+        (
+            cloudinary.exceptions.Error,
+            requests.RequestException,
+            # Raised while streaming a body from response.raw, e.g. a
+            # connection reset or read timeout in the middle of a download
+            urllib3.exceptions.HTTPError,
+            ConnectionError,
+            TimeoutError,
+        ),
+    )
+
+
+def retry(max_attempts=3, backoff_base=2.0):
+    """Retry a function on transient errors with exponential backoff.
+
+    Waits backoff_base ** n seconds before the n-th retry (1s, 2s, ...) and
+    re-raises the last error once max_attempts is reached.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except Exception as e:
+                    if attempt == max_attempts or not _is_retryable(e):
+                        raise
+                    delay = backoff_base ** (attempt - 1)
+                    log(
+                        f"🔁 Attempt {attempt}/{max_attempts} failed ({e}), "
+                        f"retrying in {delay:g}s..."
+                    )
+                    time.sleep(delay)
+
+        return wrapper
+
+    return decorator
 
 
 def check_file_exists(public_id, resource_type):
     """Check if a file already exists in Cloudinary."""
+    import cloudinary.api
+
     try:
         cloudinary.api.resource(public_id, resource_type=resource_type)
         return True
@@ -31,27 +205,149 @@ def check_file_exists(public_id, resource_type):
         return True
 
 
-def upload_single_file(file_path, cloud_folder, skip_duplicates=True):
-    """Upload a single file to Cloudinary with compression support."""
+def _iter_resources(resource_type, prefix):
+    """Yield all uploaded resources under a prefix, following pagination."""
+    import cloudinary.api
+
+    options = {}
+    while True:
+        result = cloudinary.api.resources(
+            type="upload",
+            resource_type=resource_type,
+            prefix=prefix,
+            max_results=500,  # Cloudinary API limit per page
+            **options,
+        )
+        yield from result.get("resources", [])
+        if not result.get("next_cursor"):
+            break
+        options["next_cursor"] = result["next_cursor"]
+
+
+def _fetch_all_resources(prefix):
+    """Fetch image, video and raw resources under a prefix concurrently.
+
+    Returns a dict of resource_type -> list of resources. Resource types
+    whose listing failed are reported and left out.
+    """
+    resources_by_type = {}
+    executor = _get_io_pool()
+    futures = {
+        executor.submit(list, _iter_resources(resource_type, prefix)): resource_type
+        for resource_type in ["image", "video", "raw"]
+    }
+    for future in as_completed(futures):
+        resource_type = futures[future]
+        try:
+            resources_by_type[resource_type] = future.result()
+        except Exception as e:
+            log(f"⚠️  Warning: Could not fetch {resource_type} resources: {e}")
+
+    # Keep the image, video, raw order regardless of completion order
+    return {
+        resource_type: resources_by_type[resource_type]
+        for resource_type in ["image", "video", "raw"]
+        if resource_type in resources_by_type
+    }
+
+
+def prefetch_existing_public_ids(
+    cloud_folder, name_prefix="", resource_types=("image", "video", "raw")
+):
+    """List existing resources under a cloud folder.
+
+    `name_prefix` and `resource_types` narrow the listing, e.g. to the raw
+    volumes of a single archive. Returns a set of (public_id, resource_type)
+    tuples, or None if the listing failed and duplicates must be checked
+    per file.
+    """
+    existing_ids = set()
+    prefix = f"{cloud_folder}/{name_prefix}"
+    try:
+        for resource_type in resource_types:
+            for resource in _iter_resources(resource_type, prefix):
+                existing_ids.add((resource["public_id"], resource_type))
+    except Exception as e:
+        log(f"⚠️  Warning: Could not prefetch existing files: {e}")
+        return None
+
+    return existing_ids
+
+
+def _is_duplicate(public_id, resource_type, existing_ids=None):
+    """Check for a duplicate using prefetched ids when available."""
+    if existing_ids is not None:
+        return (public_id, resource_type) in existing_ids
+    return check_file_exists(public_id, resource_type)
+
+
+@retry(max_attempts=UPLOAD_MAX_ATTEMPTS)
+def _upload_to_cloudinary(file_path, **options):
+    """Upload a file, using chunked uploads for large files."""
+    import cloudinary.uploader
+
+    if os.path.getsize(file_path) > LARGE_UPLOAD_THRESHOLD:
+        return cloudinary.uploader.upload_large(
+            file_path, chunk_size=LARGE_UPLOAD_CHUNK_SIZE, **options
+        )
+    return cloudinary.uploader.upload(file_path, **options)
+
+
+def upload_single_file(
+    file_path,
+    cloud_folder,
+    skip_duplicates=True,
+    existing_ids=None,
+    already_filtered=False,
+    file_size=None,
+    compressed=None,
+):
+    """Upload a single file to Cloudinary with compression support.
+
+    `existing_ids` is an optional set from prefetch_existing_public_ids()
+    used instead of querying Cloudinary for each file. `already_filtered`
+    skips the hidden/temporary file check when the caller has done it, and
+    `file_size` saves a stat when the caller already knows the size.
+    `compressed` is the compress_large_file() result when the caller has
+    already compressed the file.
+    """
     filename = os.path.basename(file_path)
 
     # Skip hidden/temporary files
-    if should_skip_file(filename):
-        print(f"⏭️  Skipping hidden/temporary file: {filename}")
+    if not already_filtered and should_skip_file(filename):
+        log(f"⏭️  Skipping hidden/temporary file: {filename}")
         return True, 0, 1  # success, uploaded_count, skipped_count
 
     # Normalize cloud folder path
     current_cloud_folder = normalize_cloud_folder(cloud_folder)
 
     try:
-        # Check if file needs compression
-        compressed_files, was_compressed = compress_large_file(file_path)
+        # Check if file needs compression (small files skip 7z entirely)
+        if compressed is None:
+            if file_size is None:
+                file_size = os.path.getsize(file_path)
+            if file_size <= get_max_file_size_bytes():
+                compressed = file_path, False
+            else:
+                compressed = compress_large_file(file_path)
+        compressed_files, was_compressed = compressed
 
         # Handle multiple files (compressed volumes) or single file
         if was_compressed and isinstance(compressed_files, list):
             uploaded_count = 0
             failed_count = 0
 
+            # One listing covers all volumes instead of a check per volume.
+            # Volumes are raw files named after the archive, so only those
+            # are listed rather than the whole folder
+            if skip_duplicates and existing_ids is None:
+                archive_name = get_cloudinary_filename(compressed_files[0])
+                existing_ids = prefetch_existing_public_ids(
+                    current_cloud_folder,
+                    name_prefix=archive_name,
+                    resource_types=("raw",),
+                )
+
             # Upload all volume files
             for i, volume_file in enumerate(compressed_files):
                 volume_filename = get_cloudinary_filename(
@@ -64,20 +360,20 @@ def upload_single_file(file_path, cloud_folder, skip_duplicates=True):
 
                 # Check for duplicates if enabled
                 final_public_id = f"{current_cloud_folder}/{volume_filename}"
-                if skip_duplicates and check_file_exists(
-                    final_public_id, resource_type
+                if skip_duplicates and _is_duplicate(
+                    final_public_id, resource_type, existing_ids
                 ):
-                    print(
+                    log(
                         f"⏭️  Skipping volume {i+1}/{len(compressed_files)} - already exists"
                     )
                     continue
 
                 try:
-                    print(
+                    log(
                         f"📄 Uploading volume {i+1}/{len(compressed_files)}: {os.path.basename(volume_file)}"
                     )
-                    print(f"🎯 Target public_id: {volume_public_id}")
-                    result = cloudinary.uploader.upload(
+                    log(f"🎯 Target public_id: {volume_public_id}")
+                    result = _upload_to_cloudinary(
                         volume_file,
                         resource_type=resource_type,
                         folder=current_cloud_folder,
@@ -86,15 +382,15 @@ def upload_single_file(file_path, cloud_folder, skip_duplicates=True):
                         unique_filename=should_use_unique_names(),
                     )
                     uploaded_count += 1
-                    print(f"✅ Success: {result.get('public_id')}")
+                    log(f"✅ Success: {result.get('public_id')}")
                 except Exception as e:
-                    print(f"❌ Failed to upload volume {i+1}: {e}")
+                    log(f"❌ Failed to upload volume {i+1}: {e}")
                     failed_count += 1
 
             # Clean up temporary files
             temp_dir = os.path.dirname(compressed_files[0])
-            shutil.rmtree(temp_dir)
-            print(f"🗑️  Cleaned up temporary files")
+            _cleanup_temp_files(shutil.rmtree, temp_dir, ignore_errors=True)
+            log(f"🗑️  Cleaning up temporary files")
 
             return failed_count == 0, uploaded_count, 0
 
@@ -113,11 +409,13 @@ def upload_single_file(file_path, cloud_folder, skip_duplicates=True):
 
             # Check for duplicates if enabled
             final_public_id = f"{current_cloud_folder}/{cloudinary_filename}"
-            if skip_duplicates and check_file_exists(final_public_id, resource_type):
+            if skip_duplicates and _is_duplicate(
+                final_public_id, resource_type, existing_ids
+            ):
                 display_name = (
                     os.path.basename(upload_file) if was_compressed else filename
                 )
-                print(
+                log(
                     f"⏭️  Skipping '{display_name}' - already exists in '{current_cloud_folder}'"
                 )
                 return True, 0, 1
@@ -127,12 +425,12 @@ def upload_single_file(file_path, cloud_folder, skip_duplicates=True):
                 display_name = (
                     os.path.basename(upload_file) if was_compressed else filename
                 )
-                print(
+                log(
                     f"📄 Uploading {display_name} ({resource_type}) to folder '{current_cloud_folder}'..."
                 )
-                print(f"🎯 Target public_id: {target_public_id}")
+                log(f"🎯 Target public_id: {target_public_id}")
 
-                result = cloudinary.uploader.upload(
+                result = _upload_to_cloudinary(
                     upload_file,
                     resource_type=resource_type,
                     folder=current_cloud_folder,
@@ -141,32 +439,58 @@ def upload_single_file(file_path, cloud_folder, skip_duplicates=True):
                     unique_filename=should_use_unique_names(),
                 )
                 uploaded_count = 1
-                print(f"✅ Success: {result.get('public_id')}")
+                log(f"✅ Success: {result.get('public_id')}")
 
                 # Clean up compressed file if needed
                 if was_compressed and upload_file != file_path:
-                    os.remove(upload_file)
+                    _cleanup_temp_files(os.remove, upload_file)
 
                 return True, uploaded_count, 0
 
             except Exception as e:
-                print(f"❌ Failed to upload {file_path}: {e}")
+                log(f"❌ Failed to upload {file_path}: {e}")
                 # Clean up compressed file if needed
                 if was_compressed and upload_file != file_path:
-                    os.remove(upload_file)
+                    _cleanup_temp_files(os.remove, upload_file)
                 return False, 0, 0
 
     except Exception as e:
-        print(f"❌ Error processing {file_path}: {e}")
+        log(f"❌ Error processing {file_path}: {e}")
         return False, 0, 0
 
 
+def _iter_files(root):
+    """Yield (DirEntry, rel_dir) for every file under root.
+
+    Hidden directories are not descended into, and symlinked directories
+    are not followed. `rel_dir` is the "/"-joined path of the file's
+    directory relative to root ("" for root itself). Directories that can't
+    be read are reported and skipped.
+    """
+    stack = [(root, "")]
+    while stack:
+        path, rel_dir = stack.pop()
+        try:
+            entries = os.scandir(path)
+        except OSError as e:
+            log(f"⚠️  Skipping unreadable directory '{path}': {e}")
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if not entry.name.startswith(".") and not entry.is_symlink():
+                        sub_dir = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                        stack.append((entry.path, sub_dir))
+                elif entry.is_file():
+                    yield entry, rel_dir
+
+
 def upload_files(local_folder, cloud_folder, skip_duplicates=True):
     """Upload files from local folder to Cloudinary."""
     # Normalize cloud folder path
     current_cloud_folder = normalize_cloud_folder(cloud_folder)
 
-    print(f"📁 Uploading from '{local_folder}' to '{current_cloud_folder}'...")
+    log(f"📁 Uploading from '{local_folder}' to '{current_cloud_folder}'...")
 
     uploaded_count = 0
     failed_count = 0
@@ -182,48 +506,133 @@ def upload_files(local_folder, cloud_folder, skip_duplicates=True):
             skipped_count += skipped
         else:
             failed_count += 1
+    elif not os.path.isdir(local_folder):
+        log(f"❌ Local folder not found: '{local_folder}'")
     else:
-        # Directory upload - walk through all files
-        for root, dirs, files in os.walk(local_folder):
-            # Remove hidden directories from the walk
-            dirs[:] = [d for d in dirs if not d.startswith(".")]
+        # Directory upload - collect all files first
+        tasks = []
+        folder_for_dir = {}
+        queued_ids = set()
+        for entry, rel_dir in _iter_files(local_folder):
+            # Skip hidden/temporary files
+            if should_skip_file(entry.name):
+                log(f"⏭️  Skipping hidden/temporary file: {entry.name}")
+                skipped_count += 1
+                continue
+
+            # Create the cloud folder path including subdirectories
+            file_cloud_folder = folder_for_dir.get(rel_dir)
+            if file_cloud_folder is None:
+                if rel_dir:
+                    file_cloud_folder = f"{current_cloud_folder}/{rel_dir}"
+                else:
+                    file_cloud_folder = current_cloud_folder
+                folder_for_dir[rel_dir] = file_cloud_folder
 
-            for file in files:
-                file_path = os.path.join(root, file)
+            try:
+                file_size = entry.stat().st_size
+            except OSError as e:
+                log(f"❌ Error processing {entry.path}: {e}")
+                failed_count += 1
+                continue
+
+            # Files like a.jpg and a.png share a public_id; uploading both
+            # concurrently would race, so only the first one is uploaded
+            queued_id = (
+                f"{file_cloud_folder}/{get_cloudinary_filename(entry.name)}",
+                get_resource_type(entry.name),
+            )
+            if queued_id in queued_ids:
+                log(
+                    f"⏭️  Skipping '{entry.name}' - already exists in '{file_cloud_folder}'"
+                )
+                skipped_count += 1
+                continue
+            queued_ids.add(queued_id)
 
-                # Calculate relative path to preserve directory structure
-                relative_path = os.path.relpath(file_path, local_folder)
+            tasks.append((entry.path, file_cloud_folder, file_size))
 
-                # Create the cloud folder path including subdirectories
-                if os.path.dirname(relative_path):
-                    file_cloud_folder = (
-                        f"{current_cloud_folder}/{os.path.dirname(relative_path)}"
-                    )
-                else:
-                    file_cloud_folder = current_cloud_folder
+        # Fetch existing files once instead of checking each file
+        existing_ids = None
+        if skip_duplicates and tasks:
+            existing_ids = prefetch_existing_public_ids(current_cloud_folder)
 
-                success, uploaded, skipped = upload_single_file(
-                    file_path, file_cloud_folder.replace(os.sep, "/"), skip_duplicates
+        # Upload files concurrently
+        executor = _get_io_pool()
+
+        # Large files hold a slot from the start of their compression until
+        # their upload has finished (upload_single_file removes the volumes
+        # inline on pool threads), which caps how many files' volumes sit in
+        # the temp dir at once
+        slots = threading.Semaphore(MAX_PARALLEL_COMPRESSIONS)
+
+        def upload(file_path, file_cloud_folder, file_size, compressed=None):
+            try:
+                return upload_single_file(
+                    file_path,
+                    file_cloud_folder,
+                    skip_duplicates,
+                    existing_ids,
+                    already_filtered=True,
+                    file_size=file_size,
+                    compressed=compressed,
                 )
+            finally:
+                if compressed is not None:
+                    slots.release()
+
+        # Small files start uploading right away, while large files are
+        # compressed a few at a time, each queued for upload as soon as its
+        # own compression finishes
+        max_bytes = get_max_file_size_bytes()
+        large_tasks = {task[0]: task for task in tasks if task[2] > max_bytes}
+        futures = [
+            executor.submit(upload, *task) for task in tasks if task[2] <= max_bytes
+        ]
+        volume_dirs = {}
+
+        compressions = compress_many(list(large_tasks), slots=slots)
+        try:
+            for file_path, compressed in compressions:
+                future = executor.submit(upload, *large_tasks[file_path], compressed)
+                futures.append(future)
+                compressed_files, was_compressed = compressed
+                if was_compressed and isinstance(compressed_files, list):
+                    volume_dirs[future] = os.path.dirname(compressed_files[0])
+
+            for future in as_completed(futures):
+                success, uploaded, skipped = future.result()
                 if success:
                     uploaded_count += uploaded
                     skipped_count += skipped
                 else:
                     failed_count += 1
+        except BaseException:
+            # Don't let queued uploads keep running after Ctrl-C, and remove
+            # the volumes of large files whose upload never started
+            compressions.close()
+            _cancel_pending(futures)
+            for future, temp_dir in volume_dirs.items():
+                if future.cancelled():
+                    shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
 
     # Print summary
-    print(f"\n📊 Upload Summary:")
-    print(f"✅ Uploaded: {uploaded_count} files")
+    log(f"\n📊 Upload Summary:")
+    log(f"✅ Uploaded: {uploaded_count} files")
     if skipped_count > 0:
-        print(f"⏭️  Skipped: {skipped_count} files")
+        log(f"⏭️  Skipped: {skipped_count} files")
     if failed_count > 0:
-        print(f"❌ Failed: {failed_count} files")
+        log(f"❌ Failed: {failed_count} files")
+    flush_log()
 
     return uploaded_count, failed_count, skipped_count
 
 
 def list_folders_in_melted():
     """List all folders in the melted directory."""
+    import cloudinary.api
+
     try:
         default_folder = normalize_cloud_folder("")
         if not default_folder:
@@ -235,118 +644,175 @@ def list_folders_in_melted():
         folders = result.get("folders", [])
 
         if not folders:
-            print(f"📭 No folders found in '{default_folder or 'root'}'")
+            log(f"📭 No folders found in '{default_folder or 'root'}'")
             return []
 
-        print(f"📁 Folders in '{default_folder or 'root'}':")
+        log(f"📁 Folders in '{default_folder or 'root'}':")
         for i, folder in enumerate(folders, 1):
             folder_path = folder["path"]
-            print(f"{i}. {os.path.basename(folder_path)} (path: {folder_path})")
+            log(f"{i}. {os.path.basename(folder_path)} (path: {folder_path})")
 
         return folders
 
     except Exception as e:
-        print(f"❌ Error listing folders: {e}")
+        log(f"❌ Error listing folders: {e}")
         return []
 
 
 def delete_folder(folder_path):
     """Delete a folder and all its contents from Cloudinary."""
+    import cloudinary.api
+
     try:
-        # Delete all resources in the folder first
-        for resource_type in ["image", "video", "raw"]:
+        # Delete resources with the folder prefix, all resource types at once
+        prefix = folder_path + "/" if not folder_path.endswith("/") else folder_path
+        executor = _get_io_pool()
+        futures = {
+            executor.submit(
+                cloudinary.api.delete_resources_by_prefix,
+                prefix,
+                resource_type=resource_type,
+            ): resource_type
+            for resource_type in ["image", "video", "raw"]
+        }
+        for future in as_completed(futures):
+            resource_type = futures[future]
             try:
-                # Delete resources with the folder prefix
-                prefix = (
-                    folder_path + "/" if not folder_path.endswith("/") else folder_path
-                )
-                result = cloudinary.api.delete_resources_by_prefix(
-                    prefix, resource_type=resource_type
-                )
+                result = future.result()
                 if result.get("deleted"):
-                    print(f"🗑️  Deleted {len(result['deleted'])} {resource_type} files")
+                    log(f"🗑️  Deleted {len(result['deleted'])} {resource_type} files")
             except Exception as e:
-                print(f"⚠️  Warning: Could not delete {resource_type} resources: {e}")
+                log(f"⚠️  Warning: Could not delete {resource_type} resources: {e}")
 
         # Delete the folder itself
         try:
             cloudinary.api.delete_folder(folder_path)
-            print(f"🗑️  Deleted folder: {folder_path}")
+            log(f"🗑️  Deleted folder: {folder_path}")
         except Exception as e:
-            print(f"⚠️  Warning: Could not delete folder structure: {e}")
+            log(f"⚠️  Warning: Could not delete folder structure: {e}")
 
-        print(f"✅ Successfully deleted folder '{folder_path}' and all its contents")
+        log(f"✅ Successfully deleted folder '{folder_path}' and all its contents")
         return True
 
     except Exception as e:
-        print(f"❌ Error deleting folder '{folder_path}': {e}")
+        log(f"❌ Error deleting folder '{folder_path}': {e}")
         return False
 
 
-def download_file(url, local_path):
-    """Download a file from URL to local path."""
-    try:
-        response = requests.get(url, stream=True)
+@retry(max_attempts=DOWNLOAD_MAX_ATTEMPTS)
+def _fetch_to_file(url, local_path):
+    """Stream a URL into a local file."""
+    with _get_session().get(url, stream=True, timeout=(5, 60)) as response:
         response.raise_for_status()
 
         # Ensure the directory exists
         os.makedirs(os.path.dirname(local_path), exist_ok=True)
 
+        response.raw.decode_content = True
         with open(local_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
-
-        # Check if it's a 7z file and decompress it
-        if local_path.lower().endswith(".7z"):
-            print(f"🗜️  Decompressing {os.path.basename(local_path)}...")
-            output_dir = os.path.dirname(local_path)
-
-            from .compression import decompress_7z_file
+            shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
 
-            if decompress_7z_file(local_path, output_dir):
-                # Remove the compressed file after successful decompression
-                os.remove(local_path)
-                print(f"🗑️  Removed compressed file: {os.path.basename(local_path)}")
 
+def download_file(url, local_path):
+    """Download a file from URL to local path."""
+    try:
+        _fetch_to_file(url, local_path)
         return True
     except Exception as e:
-        print(f"❌ Failed to download {url}: {e}")
+        log(f"❌ Failed to download {url}: {e}")
         return False
 
 
-def download_folder(folder_path, local_download_path):
-    """Download all files from a Cloudinary folder."""
-    downloaded_count = 0
-    failed_count = 0
+def decompress_downloaded_file(local_path):
+    """Decompress a downloaded single-volume 7z file in place."""
+    if not local_path.lower().endswith(".7z"):
+        return
 
-    print(f"📥 Starting download from '{folder_path}' to '{local_download_path}'...")
+    log(f"🗜️  Decompressing {os.path.basename(local_path)}...")
+    output_dir = os.path.dirname(local_path)
 
-    try:
-        # Create local download directory
-        os.makedirs(local_download_path, exist_ok=True)
+    if decompress_7z_file(local_path, output_dir):
+        # Remove the compressed file after successful decompression
+        os.remove(local_path)
+        log(f"🗑️  Removed compressed file: {os.path.basename(local_path)}")
 
-        # Get all resources in folder for each resource type
-        for resource_type in ["image", "video", "raw"]:
+
+@retry(max_attempts=DOWNLOAD_MAX_ATTEMPTS)
+def _fetch_archive(url, archive_file):
+    """Stream a folder archive into an open temp file, replacing its contents."""
+    archive_file.seek(0)
+    archive_file.truncate()
+    with _get_session().get(url, stream=True, timeout=(5, 300)) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        shutil.copyfileobj(response.raw, archive_file, length=DOWNLOAD_CHUNK_SIZE)
+
+
+def _download_folder_archive(folder_path, local_download_path):
+    """Download a folder as a single ZIP archive and extract it.
+
+    Returns the list of extracted file paths, or None if the archive could
+    not be created or downloaded. Files extracted before a failure are
+    removed again, as the caller then downloads every file one by one.
+    """
+    import cloudinary.utils
+
+    extracted = []
+    try:
+        # Slash-terminated so "photos" does not also match "photos_2024/..."
+        prefix = folder_path.rstrip("/") + "/"
+        archive_url = cloudinary.utils.download_folder(
+            prefix, target_format="zip", flatten_folders=True
+        )
+        with tempfile.TemporaryFile() as archive_file:
+            _fetch_archive(archive_url, archive_file)
+
+            with zipfile.ZipFile(archive_file) as archive:
+                for name in archive.namelist():
+                    if name.endswith("/"):
+                        continue
+                    # Recorded up front so a partly written file is removed too
+                    extracted.append(os.path.join(local_download_path, name))
+                    archive.extract(name, local_download_path)
+    except Exception as e:
+        for local_file_path in extracted:
             try:
-                # Get resources with prefix matching the folder
-                prefix = (
-                    folder_path + "/" if not folder_path.endswith("/") else folder_path
-                )
-                result = cloudinary.api.resources(
-                    type="upload",
-                    resource_type=resource_type,
-                    prefix=prefix,
-                    max_results=500,  # Cloudinary API limit
-                )
+                os.remove(local_file_path)
+            except OSError:
+                pass
+        log(f"⚠️  Archive download unavailable ({e}), downloading files one by one")
+        return None
+
+    return extracted
+
+
+def _download_folder_files(folder_path, local_download_path):
+    """Download every file of a folder individually.
 
-                resources = result.get("resources", [])
+    Returns a (downloaded_count, failed_count) tuple.
+    """
+    downloaded_count = 0
+    failed_count = 0
 
+    # Get resources with prefix matching the folder
+    prefix = folder_path + "/" if not folder_path.endswith("/") else folder_path
+    resources_by_type = _fetch_all_resources(prefix)
+
+    # Download concurrently; decompress finished files on a separate
+    # worker so decompression overlaps the remaining downloads
+    download_executor = _get_io_pool()
+    targets = {}  # local_file_path -> public_id
+    with ThreadPoolExecutor(max_workers=1) as decompress_executor:
+        futures = {}
+        decompress_futures = {}
+        try:
+            for resources in resources_by_type.values():
                 for resource in resources:
                     public_id = resource["public_id"]
                     secure_url = resource["secure_url"]
 
                     # Extract filename from public_id (remove folder path)
-                    filename = public_id.replace(prefix, "").split("/")[-1]
+                    filename = public_id.rsplit("/", 1)[-1]
 
                     # Add appropriate extension based on format
                     if "format" in resource:
@@ -354,78 +820,130 @@ def download_folder(folder_path, local_download_path):
 
                     local_file_path = os.path.join(local_download_path, filename)
 
-                    print(f"📄 Downloading {filename}...")
-                    if download_file(secure_url, local_file_path):
-                        downloaded_count += 1
-                        print(f"✅ Success: {local_file_path}")
-                    else:
+                    # Files from different subfolders can share a name once
+                    # flattened; never write two downloads to the same path
+                    if local_file_path in targets:
+                        log(
+                            f"⚠️  Skipping {public_id}: same local file name "
+                            f"({filename}) as {targets[local_file_path]}"
+                        )
                         failed_count += 1
+                        continue
+                    targets[local_file_path] = public_id
 
-            except Exception as e:
-                print(f"⚠️  Warning: Could not fetch {resource_type} resources: {e}")
+                    log(f"📄 Downloading {filename}...")
+                    future = download_executor.submit(
+                        download_file, secure_url, local_file_path
+                    )
+                    futures[future] = local_file_path
+
+            for future in as_completed(futures):
+                local_file_path = futures[future]
+                if future.result():
+                    downloaded_count += 1
+                    log(f"✅ Success: {local_file_path}")
+                    decompress_future = decompress_executor.submit(
+                        decompress_downloaded_file, local_file_path
+                    )
+                    decompress_futures[decompress_future] = local_file_path
+                else:
+                    failed_count += 1
+        except BaseException:
+            # Don't let queued downloads keep running after Ctrl-C
+            _cancel_pending(futures)
+            _cancel_pending(decompress_futures)
+            raise
+
+    for future, local_file_path in decompress_futures.items():
+        error = future.exception()
+        if error is not None:
+            log(f"❌ Failed to decompress {local_file_path}: {error}")
+
+    return downloaded_count, failed_count
+
+
+def download_folder(folder_path, local_download_path):
+    """Download all files from a Cloudinary folder."""
+    downloaded_count = 0
+    failed_count = 0
+
+    log(f"📥 Starting download from '{folder_path}' to '{local_download_path}'...")
+
+    try:
+        # Create local download directory
+        os.makedirs(local_download_path, exist_ok=True)
+
+        # Fetch the whole folder as one ZIP archive, falling back to
+        # downloading each file when the archive is not available
+        extracted_files = _download_folder_archive(folder_path, local_download_path)
+        if extracted_files is not None:
+            downloaded_count = len(extracted_files)
+            log(f"✅ Extracted {downloaded_count} files from folder archive")
+            for local_file_path in extracted_files:
+                decompress_downloaded_file(local_file_path)
+        else:
+            downloaded_count, failed_count = _download_folder_files(
+                folder_path, local_download_path
+            )
 
     except Exception as e:
-        print(f"❌ Error downloading folder '{folder_path}': {e}")
+        log(f"❌ Error downloading folder '{folder_path}': {e}")
+        flush_log()
         return
 
-    # After all downloads, check for and decompress archives
+    # After all downloads, check for and decompress multi-volume archives
     if downloaded_count > 0:
-        print(f"\n🔍 Checking for compressed archives...")
+        log(f"\n🔍 Checking for compressed archives...")
+        flush_log()
         detect_and_decompress_archives(local_download_path)
 
-    print(f"\n🎉 Download completed!")
-    print(f"✅ Successfully downloaded: {downloaded_count} files")
+    log(f"\n🎉 Download completed!")
+    log(f"✅ Successfully downloaded: {downloaded_count} files")
     if failed_count > 0:
-        print(f"❌ Failed downloads: {failed_count} files")
-    print(f"📁 Files saved to: {local_download_path}")
+        log(f"❌ Failed downloads: {failed_count} files")
+    log(f"📁 Files saved to: {local_download_path}")
+    flush_log()
 
 
 def list_files_in_folder(folder_path):
     """List files in a specific Cloudinary folder."""
     try:
-        print(f"📁 Files in '{folder_path}':")
+        log(f"📁 Files in '{folder_path}':")
+
+        # Get resources with prefix matching the folder
+        prefix = folder_path + "/" if not folder_path.endswith("/") else folder_path
+        resources_by_type = _fetch_all_resources(prefix)
+        flush_log()
 
         total_files = 0
-        for resource_type in ["image", "video", "raw"]:
-            try:
-                # Get resources with prefix matching the folder
-                prefix = (
-                    folder_path + "/" if not folder_path.endswith("/") else folder_path
+        for resources in resources_by_type.values():
+            # Build the listing for each resource type and write it at once
+            lines = []
+            for resource in resources:
+                public_id = resource["public_id"]
+                secure_url = resource["secure_url"]
+                created_at = resource.get("created_at", "Unknown")
+
+                # Extract filename from public_id
+                filename = public_id.rsplit("/", 1)[-1]
+                if "format" in resource:
+                    filename += f".{resource['format']}"
+
+                lines.append(
+                    f"  📄 {filename}\n"
+                    f"     ID: {public_id}\n"
+                    f"     URL: {secure_url}\n"
+                    f"     Created: {created_at}\n"
                 )
-                result = cloudinary.api.resources(
-                    type="upload",
-                    resource_type=resource_type,
-                    prefix=prefix,
-                    max_results=500,
-                )
-
-                resources = result.get("resources", [])
 
-                for resource in resources:
-                    public_id = resource["public_id"]
-                    secure_url = resource["secure_url"]
-                    created_at = resource.get("created_at", "Unknown")
-
-                    # Extract filename from public_id
-                    filename = public_id.replace(prefix, "").split("/")[-1]
-                    if "format" in resource:
-                        filename += f".{resource['format']}"
-
-                    print(f"  📄 {filename}")
-                    print(f"     ID: {public_id}")
-                    print(f"     URL: {secure_url}")
-                    print(f"     Created: {created_at}")
-                    print()
-
-                    total_files += 1
-
-            except Exception as e:
-                print(f"⚠️  Warning: Could not fetch {resource_type} resources: {e}")
+            if lines:
+                log("\n".join(lines))
+            total_files += len(resources)
 
         if total_files == 0:
-            print(f"📭 No files found in folder '{folder_path}'")
+            log(f"📭 No files found in folder '{folder_path}'")
         else:
-            print(f"📊 Total files: {total_files}")
+            log(f"📊 Total files: {total_files}")
 
     except Exception as e:
-        print(f"❌ Error listing files in folder '{folder_path}': {e}")
+        log(f"❌ Error listing files in folder '{folder_path}': {e}")
@@ -4,22 +4,61 @@ Uses 7z for splitting large files into manageable volumes.
 """
 
 import os
+import re
 import subprocess
 import tempfile
 import shutil
-from .config import get_max_file_size
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from .config import get_max_file_size, get_compression_level
+from .output import log
+from .utils import get_resource_type
 
+# Suffix of 7z volume files: ".7z.001", ".7z.002", ...
+_VOLUME_SUFFIX_RE = re.compile(r"\.7z\.\d{3}")
 
+# Block size used when streaming files into 7z
+STREAM_BUFFER_SIZE = 1024 * 1024
+
+# Large files compressed at the same time by compress_many(). Each 7z gets an
+# equal share of the CPU cores.
+MAX_PARALLEL_COMPRESSIONS = 2
+
+# Environment passed to 7z: only what it needs, rather than a copy of the
+# whole user environment. The locale is kept so non-ASCII file names survive,
+# and the temp/system dirs so 7z can still create scratch files.
+_MIN_ENV = {
+    key: os.environ[key]
+    for key in (
+        "PATH",
+        "LANG",
+        "LC_ALL",
+        "LC_CTYPE",
+        "TMPDIR",
+        "TEMP",
+        "TMP",
+        "SYSTEMROOT",
+    )
+    if key in os.environ
+}
+
+
+def _is_volume_of(name, base_name):
+    """Check whether name is a 7z volume ("<base_name>.7z.NNN") of base_name."""
+    return name.startswith(base_name) and bool(
+        _VOLUME_SUFFIX_RE.fullmatch(name, len(base_name))
+    )
+
+
+@lru_cache(maxsize=1)
 def check_7z_available():
-    """Check if 7z is available in the system."""
+    """Check if 7z is available in the system (result is cached)."""
     # Try different 7z command names
     commands = ["7zz", "7z", "7za"]
     for cmd in commands:
-        try:
-            subprocess.run([cmd], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if shutil.which(cmd):
             return cmd
-        except FileNotFoundError:
-            continue
     return None
 
 
@@ -28,122 +67,267 @@ def get_file_size_mb(file_path):
     return os.path.getsize(file_path) / (1024 * 1024)
 
 
-def compress_large_file(file_path, max_size_mb=None):
-    """Compress large files using 7z with volume splitting."""
+def get_compression_args(file_path):
+    """Get 7z compression switches suited to the file type.
+
+    Images and videos are already compressed, so they go through the Copy
+    coder and are only split into volumes; other files use the configured
+    compression level.
+    """
+    if get_resource_type(file_path) in ("image", "video"):
+        return ["-m0=Copy", "-mx=0"]
+    return [f"-mx={get_compression_level()}"]
+
+
+def compress_large_file(file_path, max_size_mb=None, threads=None):
+    """Compress large files using 7z with volume splitting.
+
+    `threads` limits the CPU threads 7z may use (all cores by default).
+    """
     cmd_7z = check_7z_available()
     if not cmd_7z:
-        print("⚠️  7z not available. Large files will be uploaded as-is.")
+        log("⚠️  7z not available. Large files will be uploaded as-is.")
         return file_path, False
 
     # Get max file size from env or default to 8MB (safely under 10MB limit)
     if max_size_mb is None:
         max_size_mb = get_max_file_size()
 
-    file_size_mb = get_file_size_mb(file_path)
-    if file_size_mb <= max_size_mb:
+    # Compare whole bytes; MB are only needed for the message below
+    file_size = os.path.getsize(file_path)
+    if file_size <= int(max_size_mb * 1024 * 1024):
         return file_path, False
 
-    print(f"📦 File is {file_size_mb:.1f}MB, compressing and splitting...")
+    log(f"📦 File is {file_size / (1024 * 1024):.1f}MB, compressing and splitting...")
 
-    # Create temporary directory for compressed files
+    # Create temporary directory for compressed files. On success it is
+    # handed to the caller along with the volumes (upload_single_file removes
+    # it); on every other exit, including interrupts, it is removed here.
     temp_dir = tempfile.mkdtemp(prefix="cloudinary_compress_")
-    base_name = os.path.splitext(os.path.basename(file_path))[0]
-    archive_path = os.path.join(temp_dir, f"{base_name}.7z")
+    succeeded = False
 
     try:
+        base_name = os.path.splitext(os.path.basename(file_path))[0]
+        archive_path = os.path.join(temp_dir, f"{base_name}.7z")
+
         # Compress with volume splitting (each volume max size)
         volume_size = f"{int(max_size_mb)}m"
         cmd = [
             cmd_7z,
             "a",
+            "-si" + os.path.basename(file_path),  # Read data from stdin
             "-v" + volume_size,  # Volume size
-            "-mx=5",  # Compression level (0-9, 5 is balanced)
+            *get_compression_args(file_path),
+            "-mmt=on" if threads is None else f"-mmt={threads}",
             archive_path,
-            file_path,
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            print(f"❌ Compression failed: {result.stderr}")
-            shutil.rmtree(temp_dir)
-            return file_path, False
+        # Stream the file into 7z in large blocks. Progress output is
+        # discarded; stderr goes to a temp file (a pipe could fill up and
+        # block 7z while we are still writing) and is only read on failure
+        with open(
+            file_path, "rb", buffering=STREAM_BUFFER_SIZE
+        ) as source, tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=stderr_file,
+                bufsize=STREAM_BUFFER_SIZE,
+                env=_MIN_ENV,
+            )
+            try:
+                shutil.copyfileobj(source, process.stdin, length=STREAM_BUFFER_SIZE)
+            except BrokenPipeError:
+                pass  # 7z exited early; reported through its return code
+            finally:
+                try:
+                    process.stdin.close()
+                except BrokenPipeError:
+                    pass
+            returncode = process.wait()
+
+            if returncode != 0:
+                stderr_file.seek(0)
+                stderr = stderr_file.read().decode(errors="replace")
+                log(f"❌ Compression failed: {stderr}")
+                return file_path, False
 
         # Find all volume files
-        volume_files = []
-        for f in os.listdir(temp_dir):
-            if f.startswith(base_name) and ".7z." in f:
-                volume_files.append(os.path.join(temp_dir, f))
+        with os.scandir(temp_dir) as entries:
+            volume_files = [
+                entry.path for entry in entries if _is_volume_of(entry.name, base_name)
+            ]
 
         volume_files.sort()  # Ensure correct order
 
         if not volume_files:
-            print("❌ No volume files created")
-            shutil.rmtree(temp_dir)
+            log("❌ No volume files created")
             return file_path, False
 
-        print(f"✅ Compressed into {len(volume_files)} volumes")
+        log(f"✅ Compressed into {len(volume_files)} volumes")
+        succeeded = True
         return volume_files, True
 
     except Exception as e:
-        print(f"❌ Compression error: {e}")
-        shutil.rmtree(temp_dir)
+        log(f"❌ Compression error: {e}")
         return file_path, False
 
+    finally:
+        if not succeeded:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def compress_many(file_paths, max_workers=MAX_PARALLEL_COMPRESSIONS, slots=None):
+    """Compress several large files concurrently, one 7z process per worker.
+
+    Yields (file_path, compress_large_file() result) pairs as each file
+    finishes, so callers can start uploading it while the rest compress.
+
+    `slots` is an optional semaphore acquired before each file is compressed
+    and released by the caller once it is done with that file's volumes, so
+    the volumes of at most that many files exist at once.
+    """
+    if not file_paths:
+        return
+
+    # Share the cores between the 7z processes instead of letting each one
+    # start a thread per core
+    workers = max(1, min(max_workers, len(file_paths)))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    stopping = threading.Event()
+
+    def compress(file_path):
+        if slots is not None:
+            # Wait for a free slot, giving up once the caller has stopped
+            while not slots.acquire(timeout=0.1):
+                if stopping.is_set():
+                    return file_path, False
+        return compress_large_file(file_path, threads=threads)
+
+    # Threads are enough: they only wait on the 7z subprocesses
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(compress, file_path): file_path for file_path in file_paths
+        }
+        handed_out = set()
+        try:
+            for future in as_completed(futures):
+                handed_out.add(future)
+                yield futures[future], future.result()
+        except BaseException:
+            # Interrupted or closed early: drop queued files and remove the
+            # volumes of finished ones that were never handed out
+            stopping.set()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+            for future in futures:
+                if future.done() and not future.cancelled():
+                    if future not in handed_out:
+                        _discard_volumes(future.result())
+            raise
+
+
+def _discard_volumes(result):
+    """Remove the temp dir of a compress_large_file() result, if it has one."""
+    volume_files, was_compressed = result
+    if was_compressed and isinstance(volume_files, list):
+        shutil.rmtree(os.path.dirname(volume_files[0]), ignore_errors=True)
+
 
 def decompress_7z_file(file_path, output_dir):
     """Decompress 7z file(s)."""
     cmd_7z = check_7z_available()
     if not cmd_7z:
-        print("⚠️  7z not available. Cannot decompress files.")
+        log("⚠️  7z not available. Cannot decompress files.")
         return False
 
     try:
         # Extract the archive
         cmd = [cmd_7z, "x", file_path, f"-o{output_dir}", "-y"]
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = subprocess.run(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            check=False,
+            env=_MIN_ENV,
+        )
 
         if result.returncode != 0:
-            print(f"❌ Decompression failed: {result.stderr}")
+            log(f"❌ Decompression failed: {result.stderr.decode(errors='replace')}")
             return False
 
-        print(f"✅ Decompressed: {file_path}")
+        log(f"✅ Decompressed: {file_path}")
         return True
 
     except Exception as e:
-        print(f"❌ Decompression error: {e}")
+        log(f"❌ Decompression error: {e}")
         return False
 
 
+def _remove_volumes(download_dir, base_names):
+    """Remove all volume files of the given archives in one directory scan.
+
+    Returns a dict of base name -> number of volumes removed.
+    """
+    removed = dict.fromkeys(base_names, 0)
+    with os.scandir(download_dir) as entries:
+        for entry in entries:
+            # Every volume suffix (".7z.NNN") is 7 characters long
+            base_name = entry.name[:-7]
+            if base_name in removed and _is_volume_of(entry.name, base_name):
+                os.remove(entry.path)
+                removed[base_name] += 1
+    return removed
+
+
+def _decompress_archive(volume_path, download_dir):
+    """Decompress one multi-volume archive given its first volume.
+
+    Returns the archive's base name on success, None otherwise.
+    """
+    volume_file = os.path.basename(volume_path)
+    log(f"🗜️  Detected multi-volume archive: {volume_file}")
+
+    if decompress_7z_file(volume_path, download_dir):
+        return volume_file[: -len(".7z.001")]
+
+    log(f"❌ Failed to decompress {volume_file}")
+    return None
+
+
 def detect_and_decompress_archives(download_dir):
     """Detect and decompress 7z archives in the download directory."""
     try:
-        # Look for .7z.001 files (first volume of multi-volume archives)
-        volume_files = [f for f in os.listdir(download_dir) if f.endswith(".7z.001")]
-
-        for volume_file in volume_files:
-            volume_path = os.path.join(download_dir, volume_file)
-            print(f"🗜️  Detected multi-volume archive: {volume_file}")
-
-            if decompress_7z_file(volume_path, download_dir):
-                # Remove all volume files after successful decompression
-                base_name = volume_file.replace(".7z.001", ".7z")
-                volume_pattern = base_name + "."
-
-                removed_count = 0
-                for f in os.listdir(download_dir):
-                    if f.startswith(volume_pattern) and (
-                        f.endswith(".001")
-                        or f.endswith(".002")
-                        or f.endswith(".003")
-                        or ".7z.0" in f
-                    ):
-                        volume_to_remove = os.path.join(download_dir, f)
-                        os.remove(volume_to_remove)
-                        removed_count += 1
-
-                print(f"🗑️  Removed {removed_count} volume files after decompression")
-            else:
-                print(f"❌ Failed to decompress {volume_file}")
+        # Look for .7z.001 files (first volume of multi-volume archives). The
+        # scan finishes before any extraction starts, so files written by 7z
+        # never show up in it
+        with os.scandir(download_dir) as entries:
+            volume_paths = [
+                entry.path for entry in entries if entry.name.endswith(".7z.001")
+            ]
+
+        # Run one 7z process per archive concurrently
+        decompressed = []
+        if volume_paths:
+            workers = min(len(volume_paths), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(
+                    _decompress_archive,
+                    volume_paths,
+                    [download_dir] * len(volume_paths),
+                )
+                decompressed = [base_name for base_name in results if base_name]
+
+        # Remove the volumes of all extracted archives in one pass
+        if decompressed:
+            removed = _remove_volumes(download_dir, decompressed)
+            for base_name, removed_count in removed.items():
+                log(
+                    f"🗑️  Removed {removed_count} volume files of {base_name}.7z"
+                    " after decompression"
+                )
 
     except Exception as e:
-        print(f"⚠️  Error during archive detection/decompression: {e}")
+        log(f"⚠️  Error during archive detection/decompression: {e}")
@@ -4,15 +4,24 @@ Handles environment variables and settings.
 """
 
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
-import cloudinary
 
 # Load environment variables
 load_dotenv()
 
+# Settings are read from the environment once and cached, as they don't
+# change while the process runs. Use reset_config_cache() to re-read them.
 
+
+@lru_cache(maxsize=1)
 def get_cloudinary_config():
-    """Get Cloudinary configuration from environment variables."""
+    """Get Cloudinary configuration from environment variables.
+
+    The configuration is built and validated on the first call, which
+    initialize_cloudinary() makes at startup; later calls return the cached
+    dict.
+    """
     config = {
         "cloud_name": os.getenv("CLOUDINARY_CLOUD_NAME"),
         "api_key": os.getenv("CLOUDINARY_API_KEY"),
@@ -35,21 +44,59 @@ def get_cloudinary_config():
 
 def initialize_cloudinary():
     """Initialize Cloudinary with configuration from environment."""
+    import cloudinary
+
     config = get_cloudinary_config()
     cloudinary.config(**config)
     return config
 
 
+@lru_cache(maxsize=1)
 def get_default_folder():
     """Get the default folder for uploads."""
     return os.getenv("CLOUDINARY_DEFAULT_FOLDER", "")
 
 
+@lru_cache(maxsize=1)
 def should_use_unique_names():
     """Check if Cloudinary should generate unique filenames."""
     return os.getenv("CLOUDINARY_UNIQUE_NAMES", "false").lower() == "true"
 
 
+@lru_cache(maxsize=1)
 def get_max_file_size():
     """Get maximum file size before compression (in MB)."""
     return float(os.getenv("CLOUDINARY_MAX_FILE_SIZE", "8"))
+
+
+@lru_cache(maxsize=1)
+def get_max_file_size_bytes():
+    """Get maximum file size before compression (in bytes)."""
+    return int(get_max_file_size() * 1024 * 1024)
+
+
+@lru_cache(maxsize=1)
+def get_compression_level():
+    """Get the 7z compression level (0-9) for non-media files."""
+    return int(os.getenv("CLOUDINARY_COMPRESSION_LEVEL", "3"))
+
+
+@lru_cache(maxsize=1)
+def get_worker_count():
+    """Get the number of concurrent network operations (capped at 16)."""
+    workers = int(os.getenv("CLOUDINARY_WORKERS", "8"))
+    return max(1, min(workers, 16))
+
+
+def reset_config_cache():
+    """Clear cached settings so they are re-read from the environment."""
+    for getter in (
+        get_cloudinary_config,
+        get_default_folder,
+        should_use_unique_names,
+        get_max_file_size,
+        get_max_file_size_bytes,
+        get_compression_level,
+        get_worker_count,
+    ):
+        getter.cache_clear()
@@ -0,0 +1,92 @@
+"""
+Console output for the Cloudinary CLI.
+Keeps output from worker threads and the main thread in order.
+"""
+
+import atexit
+import queue
+import sys
+import threading
+
+# Output from worker threads is queued and written in batches by a single
+# writer thread, so lines don't interleave and workers don't block on stdout.
+# The main thread writes directly, after anything still queued. Both go
+# through the same sys.stdout buffer, which is flushed once per batch and by
+# flush_log().
+_log_queue = queue.Queue()
+_log_thread = None
+_log_lock = threading.Lock()
+
+
+def _strip_line(line):
+    """Remove a leading emoji from one line, keeping its indentation."""
+    text = line.lstrip()
+    start = len(line) - len(text)
+    end = 0
+    while end < len(text) and not text[end].isascii() and not text[end].isalnum():
+        end += 1
+    if end == 0:
+        return line
+    return line[:start] + text[end:].lstrip(" ")
+
+
+def _strip_emoji(message):
+    """Remove leading emoji, e.g. "✅ Success" -> "Success", on every line."""
+    return "\n".join(_strip_line(line) for line in message.split("\n"))
+
+
+def _write_output(text, flush=False):
+    """Write text to stdout, ignoring a closed stdout."""
+    try:
+        sys.stdout.write(text)
+        if flush:
+            sys.stdout.flush()
+    except (OSError, ValueError):
+        # stdout was closed (e.g. piped into `head`); drop the output
+        pass
+
+
+def _log_writer():
+    """Drain the log queue, writing all pending lines at once."""
+    while True:
+        lines = [_log_queue.get()]
+        while True:
+            try:
+                lines.append(_log_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            _write_output("".join(lines), flush=True)
+        finally:
+            for _ in lines:
+                _log_queue.task_done()
+
+
+def log(message=""):
+    """Print a line of output. Emoji prefixes are dropped when piped."""
+    global _log_thread
+    if not sys.stdout.isatty():
+        message = _strip_emoji(message)
+
+    if threading.current_thread() is threading.main_thread():
+        # Let queued lines from workers go first
+        if _log_thread is not None:
+            _log_queue.join()
+        _write_output(message + "\n")
+        return
+
+    with _log_lock:
+        if _log_thread is None:
+            _log_thread = threading.Thread(
+                target=_log_writer, name="log-writer", daemon=True
+            )
+            _log_thread.start()
+            atexit.register(flush_log)
+    _log_queue.put(message + "\n")
+
+
+def flush_log():
+    """Wait until all queued output has been written, then flush stdout."""
+    if _log_thread is not None:
+        _log_queue.join()
+    _write_output("", flush=True)
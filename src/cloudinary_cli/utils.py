@@ -3,98 +3,101 @@ Utility functions for the Cloudinary CLI.
 """
 
 import os
+import re
 import urllib.parse
-from .config import get_default_folder, should_use_unique_names
+from .config import (
+    get_default_folder,
+    should_use_unique_names,
+    get_cloudinary_config,
+)
+
+# Name fragments of files that should not be uploaded
+SKIP_PATTERNS = [
+    ".DS_Store",
+    ".Thumbs.db",
+    "Thumbs.db",
+    ".gitignore",
+    ".git",
+    "desktop.ini",
+    "Desktop.ini",
+    ".tmp",
+    "~$",
+    ".swp",
+    ".swo",
+    "__pycache__",
+]
+_SKIP_RE = re.compile("|".join(re.escape(pattern) for pattern in SKIP_PATTERNS))
+
+# Image extensions
+IMAGE_EXTENSIONS = {
+    ".jpg",
+    ".jpeg",
+    ".png",
+    ".gif",
+    ".bmp",
+    ".tiff",
+    ".tif",
+    ".webp",
+    ".svg",
+    ".ico",
+    ".psd",
+    ".ai",
+    ".eps",
+}
+
+# Video extensions
+VIDEO_EXTENSIONS = {
+    ".mp4",
+    ".avi",
+    ".mov",
+    ".wmv",
+    ".flv",
+    ".webm",
+    ".mkv",
+    ".m4v",
+    ".3gp",
+    ".ogv",
+    ".mxf",
+    ".ts",
+    ".m2ts",
+}
+
+# Extension -> Cloudinary resource type; anything else is "raw"
+_RESOURCE_TYPES = {
+    **dict.fromkeys(IMAGE_EXTENSIONS, "image"),
+    **dict.fromkeys(VIDEO_EXTENSIONS, "video"),
+}
 
 
 def get_resource_type(file_path):
     """Determine Cloudinary resource type based on file extension."""
     ext = os.path.splitext(file_path)[1].lower()
-
-    # Image extensions
-    image_extensions = {
-        ".jpg",
-        ".jpeg",
-        ".png",
-        ".gif",
-        ".bmp",
-        ".tiff",
-        ".tif",
-        ".webp",
-        ".svg",
-        ".ico",
-        ".psd",
-        ".ai",
-        ".eps",
-    }
-
-    # Video extensions
-    video_extensions = {
-        ".mp4",
-        ".avi",
-        ".mov",
-        ".wmv",
-        ".flv",
-        ".webm",
-        ".mkv",
-        ".m4v",
-        ".3gp",
-        ".ogv",
-        ".mxf",
-        ".ts",
-        ".m2ts",
-    }
-
-    if ext in image_extensions:
-        return "image"
-    elif ext in video_extensions:
-        return "video"
-    else:
-        return "raw"
+    return _RESOURCE_TYPES.get(ext, "raw")
 
 
 def should_skip_file(filename):
     """Check if a file should be skipped during upload."""
-    skip_patterns = [
-        ".DS_Store",
-        ".Thumbs.db",
-        "Thumbs.db",
-        ".gitignore",
-        ".git",
-        "desktop.ini",
-        "Desktop.ini",
-        ".tmp",
-        "~$",
-        ".swp",
-        ".swo",
-        "__pycache__",
-    ]
-
-    # Skip hidden files (starting with .)
-    if filename.startswith("."):
-        return True
-
-    # Skip files matching patterns
-    for pattern in skip_patterns:
-        if pattern in filename:
-            return True
-
-    return False
+    # Skip hidden files (starting with .) and files matching patterns
+    return filename.startswith(".") or _SKIP_RE.search(filename) is not None
 
 
 def normalize_cloud_folder(cloud_folder):
     """Normalize cloud folder path with default folder prefix."""
+    # get_default_folder() is cached in config (and cleared by
+    # reset_config_cache()), so nothing derived from it is cached here
     default_folder = get_default_folder()
 
     if not default_folder:
         return cloud_folder
 
+    default_prefix = default_folder + "/"
+
     # If cloud_folder already starts with default_folder, return as is
-    if cloud_folder.startswith(default_folder + "/") or cloud_folder == default_folder:
+    if cloud_folder.startswith(default_prefix) or cloud_folder == default_folder:
         return cloud_folder
 
     # Add default folder prefix
-    return f"{default_folder}/{cloud_folder}"
+    return default_prefix + cloud_folder
 
 
 def get_cloudinary_filename(file_path, local_folder=None):
@@ -108,10 +111,8 @@ def get_folder_url(cloud_folder):
     # URL encode the folder path
     encoded_folder = urllib.parse.quote(f"/{cloud_folder}", safe="")
 
-    # Get cloud name from config (we'll need to import this)
-    from .config import get_cloudinary_config
-
-    config = get_cloudinary_config()
-    cloud_name = config["cloud_name"]
+    # The config was validated by initialize_cloudinary() at startup and is
+    # cached, so this is a plain dict lookup
+    cloud_name = get_cloudinary_config()["cloud_name"]
 
     return f"https://console.cloudinary.com/console/c-{cloud_name}/media_library/folders/{encoded_folder}"